@@ -1,23 +1,68 @@
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer, field_validator
+from typing import List, Dict, Mapping, Optional, Any, Tuple
+from types import MappingProxyType
 import subprocess
-import json
-import yaml
+import orjson
+import contextlib
+import copy
 import os
 import datetime
+import gzip
+import glob
+import heapq
 import logging
 import uuid
 import asyncio
+import anyio
+import threading
+import re
+import fnmatch
+import functools
+import operator
+import time
 from pathlib import Path
 
+try:
+    from ipalib import api as ipa_api, errors as ipa_errors
+except ImportError:
+    ipa_api = ipa_errors = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="IdM Access Configurator", version="1.0.0")
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the threadpool, ipalib client and background tasks, and stop them on shutdown"""
+    # Size the threadpool that runs the blocking endpoints
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
+    # Open the long-lived ipalib client connection
+    if ipa_api is None:
+        logger.info("ipalib not available, IPA commands will use the ipa CLI")
+    else:
+        try:
+            IdMCommand.connect()
+        except Exception as e:
+            logger.error("Failed to connect ipalib client: %s", e)
+    
+    # Refresh the cached timestamp and remove temporary access as it expires
+    clock_task = asyncio.create_task(_tick())
+    temp_access_manager.start()
+    try:
+        yield
+    finally:
+        await temp_access_manager.stop()
+        clock_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await clock_task
+
+app = FastAPI(title="IdM Access Configurator", version="1.0.0",
+              default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -32,6 +77,19 @@ app.add_middleware(
 CONFIG_PATH = "/etc/idm_acf.json"
 BACKUP_DIR = "/var/log"
 BACKUP_PREFIX = "idm_acf_backup"
+BACKUP_KEEP = 20
+# fdatasync config writes before publishing them; the atomic rename alone
+# already keeps readers from seeing a torn file
+STRICT_DURABILITY = os.environ.get("STRICT_DURABILITY", "").lower() in ("1", "true", "yes")
+
+# Maximum number of IPA batches in flight at once
+IPA_CONCURRENCY = 10
+# Worker threads available to the blocking (plain def) endpoints
+THREADPOOL_SIZE = 100
+# Seconds that host and trust listings are reused across requests
+LISTING_TTL = 60
+# Delay before retrying expired grants whose cleanup failed
+CLEANUP_RETRY_SECONDS = 60
 
 # ... keep existing code (all existing data models)
 class TrustDomain(BaseModel):
@@ -41,32 +99,73 @@ class TrustDomain(BaseModel):
     type: str = "ad"
 
 class SudoTemplate(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     name: str
     commands: List[str]
     description: str
 
+SUDO_TEMPLATES: Mapping[str, SudoTemplate] = MappingProxyType({
+    "full": SudoTemplate(
+        name="full",
+        commands=["ALL"],
+        description="Full sudo access"
+    ),
+    "devops": SudoTemplate(
+        name="devops", 
+        commands=[
+            "/usr/bin/systemctl",
+            "/usr/bin/journalctl",
+            "/bin/systemctl",
+            "/bin/journalctl"
+        ],
+        description="DevOps operations"
+    ),
+    "readonly": SudoTemplate(
+        name="readonly",
+        commands=[
+            "/usr/bin/cat",
+            "/usr/bin/less",
+            "/usr/bin/tail",
+            "/usr/bin/head",
+            "/usr/bin/journalctl -xe"
+        ],
+        description="Read-only access"
+    )
+})
+
 class Role(BaseModel):
     name: str
     sudo_template: str
     description: str
 
 class Environment(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     name: str
     host_pattern: str
     roles: List[str] = ["full", "devops", "readonly"]
 
+# Environments are frozen, so every Application can share these instances
+_DEFAULT_ENVS: Tuple[Environment, ...] = (
+    Environment(name="DEV", host_pattern="*{app}*dev*"),
+    Environment(name="QUA", host_pattern="*{app}*qua*"),
+    Environment(name="PRD", host_pattern="*{app}*prd*"),
+)
+
 class Application(BaseModel):
+    # Stored applications also carry apply bookkeeping (last_applied, ...)
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     name: str
     description: str = ""
     realms: List[str] = []
-    environments: List[Environment] = Field(default_factory=lambda: [
-        Environment(name="DEV", host_pattern="*{app}*dev*"),
-        Environment(name="QUA", host_pattern="*{app}*qua*"),
-        Environment(name="PRD", host_pattern="*{app}*prd*")
-    ])
+    environments: List[Environment] = Field(default_factory=lambda: list(_DEFAULT_ENVS))
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
     updated_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
 
+APPLICATION_ADAPTER = TypeAdapter(Application)
+
 class ApplicationRequest(BaseModel):
     name: str
     description: str = ""
@@ -84,6 +183,9 @@ class TestAccessRequest(BaseModel):
     command: str = "sudo -l"
 
 class TemporaryAccessRequest(BaseModel):
+    # Timestamps are epoch seconds internally and ISO strings once serialized
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user: str
     domain: str
@@ -92,11 +194,24 @@ class TemporaryAccessRequest(BaseModel):
     role: str
     reason: str = ""
     requested_by: str = "admin"  # In real implementation, get from authentication
-    requested_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
-    expires_at: datetime.datetime
+    requested_at: float = Field(default_factory=time.time)
+    expires_at: float
     status: str = "approved"  # pending, approved, denied, expired
     approved_by: Optional[str] = None
-    approved_at: Optional[datetime.datetime] = None
+    approved_at: Optional[float] = None
+    
+    @field_validator("requested_at", "expires_at", "approved_at", mode="before")
+    @classmethod
+    def _parse_timestamp(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return datetime.datetime.fromisoformat(value).timestamp()
+        if isinstance(value, datetime.datetime):
+            return value.timestamp()
+        return value
+    
+    @field_serializer("requested_at", "expires_at", "approved_at")
+    def _serialize_timestamp(self, value: Optional[float]) -> Optional[str]:
+        return None if value is None else datetime.datetime.fromtimestamp(value).isoformat()
 
 class TemporaryAccessGrant(BaseModel):
     user: str
@@ -127,75 +242,423 @@ class SetupConfiguration(BaseModel):
 
 # ... keep existing code (IdMCommand, ConfigManager, TemporaryAccessManager, IdMManager classes)
 class IdMCommand:
-    """Wrapper for IPA commands"""
+    """Wrapper for IPA commands
+    
+    Commands are given as IPA API calls (``cmd_name``, positional args,
+    options). They run in-process through the ipalib client connected at
+    startup, or through the ``ipa`` CLI when ipalib is not installed.
+    """
+    
+    # IPA API option names whose ``ipa`` CLI spelling differs
+    CLI_OPTION_NAMES = {
+        "description": "desc",
+        "group": "groups",
+        "host": "hosts",
+        "hostgroup": "hostgroups",
+        "hbacsvc": "hbacsvcs",
+        "sudocmd": "sudocmds",
+        "ipaexternalmember": "external",
+        "realm_admin": "admin",
+        "realm_passwd": "password",
+        "targethost": "host",
+    }
     
     @staticmethod
-    def run_command(cmd: List[str]) -> Dict[str, Any]:
+    def run_command(cmd_name: str, args: Optional[List[Any]] = None,
+                    options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute IPA command and return parsed result"""
+        args, options = args or [], options or {}
+        if ipa_api is None:
+            return IdMCommand._run_cli(IdMCommand.to_argv(cmd_name, args, options))
+        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            # Parse JSON output if available
-            if result.stdout.strip().startswith('{'):
-                return json.loads(result.stdout)
-            return {"output": result.stdout, "success": True}
+            result = IdMCommand.call_api(cmd_name, *args, **options)
+            return dict(result, success=True)
+        except Exception as e:
+            logger.error("Command failed: %s %s, Error: %s", cmd_name, args, e)
+            return {"error": str(e), "success": False}
+    
+    @staticmethod
+    async def run_command_async(cmd_name: str, args: Optional[List[Any]] = None,
+                                options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute IPA command without blocking the event loop"""
+        if ipa_api is not None:
+            return await asyncio.to_thread(IdMCommand.run_command, cmd_name, args, options)
+        return await IdMCommand._run_cli_async(IdMCommand.to_argv(cmd_name, args or [], options or {}))
+    
+    @staticmethod
+    def _run_cli(cmd: List[str]) -> Dict[str, Any]:
+        """Execute an ``ipa`` CLI invocation"""
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            return IdMCommand._parse_output(result.stdout)
         except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed: {' '.join(cmd)}, Error: {e.stderr}")
-            return {"error": e.stderr, "success": False}
-        except json.JSONDecodeError:
-            return {"output": result.stdout, "success": True}
+            stderr = e.stderr.decode()
+            logger.error("Command failed: %s, Error: %s", cmd, stderr)
+            return {"error": stderr, "success": False}
+    
+    @staticmethod
+    async def _run_cli_async(cmd: List[str]) -> Dict[str, Any]:
+        """Execute an ``ipa`` CLI invocation as an asyncio subprocess"""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            stderr = stderr.decode()
+            logger.error("Command failed: %s, Error: %s", cmd, stderr)
+            return {"error": stderr, "success": False}
+        return IdMCommand._parse_output(stdout)
+    
+    @staticmethod
+    def _parse_output(stdout: bytes) -> Dict[str, Any]:
+        """Parse JSON output if available"""
+        try:
+            parsed = orjson.loads(stdout)
+        except orjson.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        return {"output": stdout.decode(), "success": True}
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _cli_prefix(cmd_name: str) -> Tuple[str, str]:
+        """``ipa`` argv prefix for an API command, built once per command"""
+        return ("ipa", cmd_name.replace("_", "-"))
+    
+    @classmethod
+    def to_argv(cls, cmd_name: str, args: List[Any], options: Dict[str, Any]) -> List[str]:
+        """Translate an IPA API call into the equivalent ``ipa`` CLI invocation"""
+        argv = [*cls._cli_prefix(cmd_name), *map(str, args)]
+        for name, value in options.items():
+            flag = f"--{cls.CLI_OPTION_NAMES.get(name, name)}"
+            if value is True:
+                argv.append(flag)
+            elif isinstance(value, (list, tuple)):
+                for v in value:
+                    argv += [flag, str(v)]
+            elif value is not None and value is not False:
+                argv += [flag, str(value)]
+        return argv
+    
+    @staticmethod
+    def connect():
+        """Bootstrap the ipalib API and open the RPC connection for this thread"""
+        if not ipa_api.isdone("finalize"):
+            ipa_api.bootstrap(context="cli")
+            ipa_api.finalize()
+        if not ipa_api.Backend.rpcclient.isconnected():
+            ipa_api.Backend.rpcclient.connect()
+    
+    @staticmethod
+    def call_api(cmd_name: str, *args, **options) -> Dict[str, Any]:
+        """Invoke an ipalib command, reconnecting once if the session has dropped"""
+        try:
+            return IdMCommand.connected_api().Command[cmd_name](*args, **options)
+        except ipa_errors.NetworkError:
+            logger.info("IPA connection lost, reconnecting")
+            ipa_api.Backend.rpcclient.disconnect()
+            return IdMCommand.connected_api().Command[cmd_name](*args, **options)
+    
+    @staticmethod
+    def connected_api():
+        """Return the ipalib API, connecting the calling thread if needed
+        
+        ipalib keeps RPC connections per thread, so worker threads each
+        connect once on first use.
+        """
+        IdMCommand.connect()
+        return ipa_api
+
+class IdMBatch:
+    """Collects IPA commands and executes them in one ``batch`` call
+    
+    Falls back to running the queued commands one by one through the
+    ``ipa`` CLI when ipalib is not installed.
+    """
+    
+    def __init__(self):
+        self.methods: List[Dict[str, Any]] = []
+    
+    def queue(self, cmd_name: str, args: List[Any], options: Optional[Dict[str, Any]] = None) -> int:
+        """Queue a command, returning its index in the flushed results"""
+        self.methods.append({"method": cmd_name, "params": [args, options or {}]})
+        return len(self.methods) - 1
+    
+    def flush(self) -> List[Dict[str, Any]]:
+        """Execute all queued commands and return one result per command"""
+        methods, self.methods = self.methods, []
+        if not methods:
+            return []
+        
+        if ipa_api is None:
+            return [IdMCommand.run_command(m["method"], *m["params"]) for m in methods]
+        
+        try:
+            response = IdMCommand.call_api("batch", methods=methods)
+        except Exception as e:
+            logger.error("Batch of %s IPA commands failed: %s", len(methods), e)
+            return [{"error": str(e), "success": False} for _ in methods]
+        
+        results = []
+        for entry in response.get("results", []):
+            if entry.get("error"):
+                results.append({"error": entry["error"], "success": False})
+            else:
+                results.append(dict(entry, success=True))
+        return results
+    
+    async def flush_async(self) -> List[Dict[str, Any]]:
+        """Execute all queued commands without blocking the event loop"""
+        if ipa_api is not None:
+            return await asyncio.to_thread(self.flush)
+        
+        # Queued commands may depend on earlier ones, so run them in order
+        methods, self.methods = self.methods, []
+        return [await IdMCommand.run_command_async(m["method"], *m["params"]) for m in methods]
 
 class ConfigManager:
     """Manages application configuration persistence"""
     
-    @staticmethod
-    def load_config() -> Dict[str, Any]:
-        """Load configuration from file"""
-        if not os.path.exists(CONFIG_PATH):
-            return {"applications": {}, "temporary_access": [], "version": "1.0", "setup_completed": False}
+    # (st_mtime_ns, st_size, parsed config) of the last read or write
+    _cache: Optional[Tuple[int, int, Dict[str, Any]]] = None
+    # Serializes cache refills and writes from the worker threads
+    _lock = threading.Lock()
+    # Serializes mutate() blocks on the event loop
+    _mutate_lock = asyncio.Lock()
+    # Validated applications, valid for the (st_mtime_ns, st_size) in _app_cache_key
+    _app_cache: Dict[str, Application] = {}
+    _app_cache_key: Optional[Tuple[int, int]] = None
+    # Encoded JSON per config section (None for the whole config), valid for _json_cache_key
+    _json_cache: Dict[Optional[str], bytes] = {}
+    _json_cache_key: Optional[Tuple[int, int]] = None
+    
+    @classmethod
+    def load_config(cls) -> Dict[str, Any]:
+        """Load configuration from file, reusing the parsed config while the file is unchanged
         
+        The returned dict is shared by every reader and must not be
+        modified; changes go through mutate().
+        """
         try:
-            with open(CONFIG_PATH, 'r') as f:
-                config = json.load(f)
+            st = os.stat(CONFIG_PATH)
+        except FileNotFoundError:
+            return {"applications": {}, "temporary_access": {}, "version": "1.0", "setup_completed": False}
+        
+        cached = cls._cache
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        
+        try:
+            with cls._lock, open(CONFIG_PATH, 'rb') as f:
+                # Key the cache on the file actually read, not the earlier stat
+                st = os.fstat(f.fileno())
+                config = orjson.loads(f.read())
                 if "temporary_access" not in config:
-                    config["temporary_access"] = []
+                    config["temporary_access"] = {}
+                elif isinstance(config["temporary_access"], list):
+                    # Older configs stored a list; index it by request id
+                    config["temporary_access"] = {row["id"]: row for row in config["temporary_access"]}
                 if "setup_completed" not in config:
                     config["setup_completed"] = False
-                return config
+                cls._cache = (st.st_mtime_ns, st.st_size, config)
+            return config
         except Exception as e:
-            logger.error(f"Failed to load config: {e}")
-            return {"applications": {}, "temporary_access": [], "version": "1.0", "setup_completed": False}
+            logger.error("Failed to load config: %s", e)
+            return {"applications": {}, "temporary_access": {}, "version": "1.0", "setup_completed": False}
+    
+    @classmethod
+    def get_application(cls, name: str) -> Optional[Application]:
+        """Return the validated application, reusing it while the file is unchanged"""
+        try:
+            st = os.stat(CONFIG_PATH)
+        except FileNotFoundError:
+            return None
+        
+        key = (st.st_mtime_ns, st.st_size)
+        if cls._app_cache_key != key:
+            cls._app_cache, cls._app_cache_key = {}, key
+        
+        app = cls._app_cache.get(name)
+        if app is None:
+            app_data = cls.load_config().get("applications", {}).get(name)
+            if app_data is None:
+                return None
+            app = APPLICATION_ADAPTER.validate_python(app_data)
+            cls._app_cache[name] = app
+        return app
+    
+    @classmethod
+    def _load_for_update(cls) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return the shared config and a private copy of it"""
+        current = cls.load_config()
+        return current, copy.deepcopy(current)
+    
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def mutate(cls, background_tasks: Optional[BackgroundTasks] = None):
+        """Yield a private copy of the config and save it when the block exits
+        
+        Writers are serialized by an asyncio lock, so a read-modify-write
+        can no longer lose a concurrent update. Nothing is written if the
+        block raises or leaves the config unchanged. Callers must not await
+        IdM calls inside the block; the load, copy and comparison run in a
+        thread so the lock is only held for the edit itself.
+        """
+        async with cls._mutate_lock:
+            current, config = await asyncio.to_thread(cls._load_for_update)
+            yield config
+            if await asyncio.to_thread(operator.eq, config, current):
+                return
+            if not await asyncio.to_thread(cls.save_config, config, background_tasks):
+                raise RuntimeError("Failed to save configuration")
+    
+    @classmethod
+    def config_json(cls, section: Optional[str] = None) -> bytes:
+        """Return the config, or one top-level section of it, encoded once per file version"""
+        try:
+            st = os.stat(CONFIG_PATH)
+        except FileNotFoundError:
+            st = None
+        
+        key = (st.st_mtime_ns, st.st_size) if st is not None else None
+        if key is None or cls._json_cache_key != key:
+            cls._json_cache, cls._json_cache_key = {}, key
+        
+        data = cls._json_cache.get(section)
+        if data is None:
+            config = cls.load_config()
+            data = orjson.dumps(config if section is None else config.get(section, {}), default=str)
+            if key is not None:
+                cls._json_cache[section] = data
+        return data
     
     @staticmethod
-    def save_config(config: Dict[str, Any]) -> bool:
-        """Save configuration to file with backup"""
+    def etag() -> Optional[str]:
+        """Validator for the current config file, or None if there is none"""
+        try:
+            st = os.stat(CONFIG_PATH)
+        except FileNotFoundError:
+            return None
+        return f'"{st.st_mtime_ns}-{st.st_size}"'
+    
+    @classmethod
+    def save_config(cls, config: Dict[str, Any], background_tasks: Optional[BackgroundTasks] = None) -> bool:
+        """Save configuration to file and write a compressed backup of it
+        
+        When background_tasks is given the backup is written after the
+        response has been sent instead of inline.
+        """
+        # Microseconds keep backups of saves within the same second apart
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        if not cls.save_config_main(config):
+            return False
+        
+        if background_tasks is not None:
+            background_tasks.add_task(cls.write_backup, config, timestamp)
+        else:
+            cls.write_backup(config, timestamp)
+        return True
+    
+    @classmethod
+    def save_config_main(cls, config: Dict[str, Any]) -> bool:
+        """Write the main JSON configuration file"""
         try:
-            # Create backup
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{BACKUP_DIR}/{BACKUP_PREFIX}_{timestamp}.yaml"
-            
-            with open(backup_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False)
-            
-            # Save main config
             config["updated_at"] = datetime.datetime.now().isoformat()
-            with open(CONFIG_PATH, 'w') as f:
-                json.dump(config, f, indent=2, default=str)
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2, default=str)
+            
+            with cls._lock:
+                # Write a temp file and rename it over the config so readers never see a partial file
+                tmp_path = CONFIG_PATH + ".tmp"
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, data)
+                    if STRICT_DURABILITY:
+                        os.fdatasync(fd)
+                    st = os.fstat(fd)
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, CONFIG_PATH)
+                
+                # Cache what a fresh load would return (datetimes already stringified)
+                cls._cache = (st.st_mtime_ns, st.st_size, orjson.loads(data))
             
             return True
         except Exception as e:
-            logger.error(f"Failed to save config: {e}")
+            logger.error("Failed to save config: %s", e)
             return False
+    
+    @staticmethod
+    def write_backup(config: Dict[str, Any], timestamp: str):
+        """Write a compressed JSON backup of the configuration and prune old ones"""
+        backup_path = f"{BACKUP_DIR}/{BACKUP_PREFIX}_{timestamp}.json.gz"
+        try:
+            with gzip.open(backup_path, 'wb', compresslevel=1) as f:
+                f.write(orjson.dumps(config, default=str))
+            
+            # Timestamped names sort chronologically
+            backups = sorted(glob.glob(f"{BACKUP_DIR}/{BACKUP_PREFIX}_*.json.gz"))
+            for old_backup in backups[:-BACKUP_KEEP]:
+                # A concurrent backup task may already have pruned it
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(old_backup)
+        except Exception as e:
+            logger.error("Failed to write config backup: %s", e)
 
 class TemporaryAccessManager:
-    """Manages temporary access grants and cleanup"""
+    """Manages temporary access grants and cleanup
+    
+    Requests are fully validated once, when granted. Rows read back from
+    the config are trusted: cleanup works on the raw rows and from_stored
+    rebuilds a model where one is needed. Expired grants are removed by a
+    single worker task that sleeps until the next expiry.
+    """
     
     def __init__(self, idm_manager, config_manager):
         self.idm_manager = idm_manager
         self.config_manager = config_manager
+        # Min-heap of (expires_at epoch seconds, request id) for approved grants
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Index the approved grants by expiry and start the cleanup worker"""
+        config = self.config_manager.load_config()
+        self._expiry_heap = [
+            (datetime.datetime.fromisoformat(temp_access["expires_at"]).timestamp(), request_id)
+            for request_id, temp_access in config["temporary_access"].items()
+            if temp_access["status"] == "approved"
+        ]
+        heapq.heapify(self._expiry_heap)
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._expiry_worker())
+    
+    async def stop(self):
+        """Cancel the cleanup worker and wait for it to finish"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
     
-    def grant_temporary_access(self, grant_request: TemporaryAccessGrant) -> TemporaryAccessRequest:
+    @staticmethod
+    def from_stored(temp_access: Dict[str, Any]) -> TemporaryAccessRequest:
+        """Rebuild a stored request without re-running validation"""
+        approved_at = temp_access.get("approved_at")
+        return TemporaryAccessRequest.model_construct(**dict(
+            temp_access,
+            requested_at=datetime.datetime.fromisoformat(temp_access["requested_at"]).timestamp(),
+            expires_at=datetime.datetime.fromisoformat(temp_access["expires_at"]).timestamp(),
+            approved_at=approved_at and datetime.datetime.fromisoformat(approved_at).timestamp(),
+        ))
+    
+    async def grant_temporary_access(self, grant_request: TemporaryAccessGrant) -> TemporaryAccessRequest:
         """Grant temporary access by creating temporary IdM objects"""
-        expires_at = datetime.datetime.now() + datetime.timedelta(hours=grant_request.duration_hours)
+        now = time.time()
+        expires_at = now + grant_request.duration_hours * 3600
         
         # Create temporary access request
         temp_request = TemporaryAccessRequest(
@@ -205,164 +668,180 @@ class TemporaryAccessManager:
             environment=grant_request.environment,
             role=grant_request.role,
             reason=grant_request.reason,
+            requested_at=now,
             expires_at=expires_at,
-            approved_at=datetime.datetime.now()
+            approved_at=now
         )
         
         # Create temporary IdM objects
-        self._create_temporary_objects(temp_request)
+        await self._create_temporary_objects(temp_request)
         
         # Save to config
-        config = self.config_manager.load_config()
-        config["temporary_access"].append(temp_request.dict())
-        self.config_manager.save_config(config)
+        async with self.config_manager.mutate() as config:
+            config["temporary_access"][temp_request.id] = temp_request.model_dump(mode="json")
         
         # Schedule cleanup
-        self._schedule_cleanup(temp_request.id, grant_request.duration_hours)
+        self._schedule_cleanup(temp_request.id, expires_at)
         
         return temp_request
     
-    def _create_temporary_objects(self, request: TemporaryAccessRequest):
-        """Create temporary IdM groups and rules"""
+    async def _create_temporary_objects(self, request: TemporaryAccessRequest):
+        """Create temporary IdM groups and rules in a single IPA batch"""
         temp_suffix = f"temp-{request.id[:8]}"
         user_principal = f"{request.user}@{request.domain}"
-        
-        # Create temporary external group
         temp_ext_group = f"{request.application}-{request.environment}-{request.role}-{temp_suffix}"
-        cmd = ["ipa", "group-add", temp_ext_group, "--external", "--desc", f"Temporary access for {user_principal}"]
-        result = IdMCommand.run_command(cmd)
-        
-        if result.get("success"):
-            # Add user to external group (simplified - in reality would add AD group)
-            member_cmd = ["ipa", "group-add-member", temp_ext_group, "--external", user_principal]
-            IdMCommand.run_command(member_cmd)
-            
-            # Create temporary POSIX group
-            temp_posix_group = f"{request.application}-{request.environment}-{request.role}-posix-{temp_suffix}"
-            posix_cmd = ["ipa", "group-add", temp_posix_group, "--desc", f"Temporary POSIX group for {user_principal}"]
-            posix_result = IdMCommand.run_command(posix_cmd)
-            
-            if posix_result.get("success"):
-                # Add external group to POSIX group
-                IdMCommand.run_command(["ipa", "group-add-member", temp_posix_group, "--groups", temp_ext_group])
-                
-                # Get existing hostgroup
-                hostgroup_name = f"{request.application}-{request.environment.lower()}-hosts"
-                
-                # Create temporary HBAC rule
-                temp_hbac = f"{request.application}-{request.environment}-{request.role}-temp-{temp_suffix}"
-                hbac_cmd = ["ipa", "hbacrule-add", temp_hbac, "--desc", f"Temporary HBAC for {user_principal}"]
-                hbac_result = IdMCommand.run_command(hbac_cmd)
-                
-                if hbac_result.get("success"):
-                    IdMCommand.run_command(["ipa", "hbacrule-add-user", temp_hbac, "--groups", temp_posix_group])
-                    IdMCommand.run_command(["ipa", "hbacrule-add-host", temp_hbac, "--hostgroups", hostgroup_name])
-                    IdMCommand.run_command(["ipa", "hbacrule-add-service", temp_hbac, "--hbacsvcs", "sshd"])
-                
-                # Create temporary sudo rule
-                temp_sudo = f"{request.application}-{request.environment}-{request.role}-sudo-temp-{temp_suffix}"
-                sudo_cmd = ["ipa", "sudorule-add", temp_sudo, "--desc", f"Temporary sudo for {user_principal}"]
-                sudo_result = IdMCommand.run_command(sudo_cmd)
-                
-                if sudo_result.get("success"):
-                    IdMCommand.run_command(["ipa", "sudorule-add-user", temp_sudo, "--groups", temp_posix_group])
-                    IdMCommand.run_command(["ipa", "sudorule-add-host", temp_sudo, "--hostgroups", hostgroup_name])
-                    
-                    # Add commands based on role
-                    template = self.idm_manager.sudo_templates.get(request.role)
-                    if template:
-                        for cmd_str in template.commands:
-                            IdMCommand.run_command(["ipa", "sudorule-add-allow-command", temp_sudo, "--sudocmds", cmd_str])
-    
-    def _schedule_cleanup(self, request_id: str, hours: int):
-        """Schedule cleanup of temporary access (simplified implementation)"""
-        # In a real implementation, this would use a proper task queue like Celery
-        # For now, we'll just log the scheduled cleanup
-        logger.info(f"Scheduled cleanup for request {request_id} in {hours} hours")
-    
-    def cleanup_expired_access(self):
-        """Clean up expired temporary access"""
-        config = self.config_manager.load_config()
-        current_time = datetime.datetime.now()
+        temp_posix_group = f"{request.application}-{request.environment}-{request.role}-posix-{temp_suffix}"
+        temp_hbac = f"{request.application}-{request.environment}-{request.role}-temp-{temp_suffix}"
+        temp_sudo = f"{request.application}-{request.environment}-{request.role}-sudo-temp-{temp_suffix}"
         
-        for temp_access in config.get("temporary_access", []):
-            request = TemporaryAccessRequest(**temp_access)
-            if request.status == "approved" and current_time >= request.expires_at:
-                self._cleanup_temporary_objects(request)
-                # Update status to expired
-                temp_access["status"] = "expired"
+        # Get existing hostgroup
+        hostgroup_name = f"{request.application}-{request.environment.lower()}-hosts"
         
-        self.config_manager.save_config(config)
-    
-    def _cleanup_temporary_objects(self, request: TemporaryAccessRequest):
-        """Remove temporary IdM objects"""
-        temp_suffix = f"temp-{request.id[:8]}"
+        batch = IdMBatch()
         
-        # Remove temporary objects (in reverse order of creation)
-        temp_sudo = f"{request.application}-{request.environment}-{request.role}-sudo-temp-{temp_suffix}"
-        temp_hbac = f"{request.application}-{request.environment}-{request.role}-temp-{temp_suffix}"
-        temp_posix_group = f"{request.application}-{request.environment}-{request.role}-posix-{temp_suffix}"
-        temp_ext_group = f"{request.application}-{request.environment}-{request.role}-{temp_suffix}"
+        # Create temporary external group and add user (simplified - in reality would add AD group)
+        batch.queue("group_add", [temp_ext_group], {"external": True, "description": f"Temporary access for {user_principal}"})
+        batch.queue("group_add_member", [temp_ext_group], {"ipaexternalmember": [user_principal]})
         
-        # Delete sudo rule
-        IdMCommand.run_command(["ipa", "sudorule-del", temp_sudo])
+        # Create temporary POSIX group containing the external group
+        batch.queue("group_add", [temp_posix_group], {"description": f"Temporary POSIX group for {user_principal}"})
+        batch.queue("group_add_member", [temp_posix_group], {"group": [temp_ext_group]})
         
-        # Delete HBAC rule
-        IdMCommand.run_command(["ipa", "hbacrule-del", temp_hbac])
+        # Create temporary HBAC rule
+        batch.queue("hbacrule_add", [temp_hbac], {"description": f"Temporary HBAC for {user_principal}"})
+        batch.queue("hbacrule_add_user", [temp_hbac], {"group": [temp_posix_group]})
+        batch.queue("hbacrule_add_host", [temp_hbac], {"hostgroup": [hostgroup_name]})
+        batch.queue("hbacrule_add_service", [temp_hbac], {"hbacsvc": ["sshd"]})
         
-        # Delete POSIX group
-        IdMCommand.run_command(["ipa", "group-del", temp_posix_group])
+        # Create temporary sudo rule
+        batch.queue("sudorule_add", [temp_sudo], {"description": f"Temporary sudo for {user_principal}"})
+        batch.queue("sudorule_add_user", [temp_sudo], {"group": [temp_posix_group]})
+        batch.queue("sudorule_add_host", [temp_sudo], {"hostgroup": [hostgroup_name]})
         
-        # Delete external group
-        IdMCommand.run_command(["ipa", "group-del", temp_ext_group])
+        # Add commands based on role
+        template = SUDO_TEMPLATES.get(request.role)
+        if template:
+            batch.queue("sudorule_add_allow_command", [temp_sudo], {"sudocmd": list(template.commands)})
         
-        logger.info(f"Cleaned up temporary access for request {request.id}")
+        await batch.flush_async()
     
-    def revoke_access(self, request_id: str):
-        """Revoke temporary access before expiration"""
-        config = self.config_manager.load_config()
+    def _schedule_cleanup(self, request_id: str, expires_at: float):
+        """Queue a grant for removal by the cleanup worker once it expires"""
+        entry = (expires_at, request_id)
+        heapq.heappush(self._expiry_heap, entry)
+        # The worker only needs waking if this is now the earliest expiry
+        if self._wakeup is not None and self._expiry_heap[0] == entry:
+            self._wakeup.set()
+        logger.info("Scheduled cleanup for request %s at %s", request_id,
+                    datetime.datetime.fromtimestamp(expires_at).isoformat())
+    
+    async def _expiry_worker(self):
+        """Sleep until the next grant expires, then clean up every grant that is due"""
+        while True:
+            self._wakeup.clear()
+            delay = self._expiry_heap[0][0] - time.time() if self._expiry_heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            now = time.time()
+            due = []
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                due.append(heapq.heappop(self._expiry_heap)[1])
+            
+            try:
+                await self.cleanup_expired_access(due)
+            except Exception as e:
+                logger.error("Failed to clean up expired access: %s", e)
+                retry_at = time.time() + CLEANUP_RETRY_SECONDS
+                for request_id in due:
+                    heapq.heappush(self._expiry_heap, (retry_at, request_id))
+    
+    async def cleanup_expired_access(self, request_ids: List[str]):
+        """Clean up the given grants if expired, removing each grant's objects concurrently"""
+        config = await asyncio.to_thread(self.config_manager.load_config)
+        # Compare as epoch seconds: stored rows may use either ISO separator
+        now = time.time()
+        
+        expired = []
+        for request_id in request_ids:
+            temp_access = config["temporary_access"].get(request_id)
+            # Revoked or deleted since it was scheduled
+            if temp_access is None or temp_access["status"] != "approved":
+                continue
+            expires_at = datetime.datetime.fromisoformat(temp_access["expires_at"]).timestamp()
+            if expires_at <= now:
+                expired.append(temp_access)
+            else:
+                # Still live, keep it queued until it does expire
+                heapq.heappush(self._expiry_heap, (expires_at, request_id))
+        
+        if not expired:
+            return
         
-        for temp_access in config.get("temporary_access", []):
-            if temp_access["id"] == request_id:
-                request = TemporaryAccessRequest(**temp_access)
-                self._cleanup_temporary_objects(request)
-                temp_access["status"] = "revoked"
-                break
+        await asyncio.gather(*(self._cleanup_temporary_objects(temp_access) for temp_access in expired))
+        
+        async with self.config_manager.mutate() as config:
+            for temp_access in expired:
+                temp_access = config["temporary_access"].get(temp_access["id"])
+                # Skip requests revoked while their objects were being removed
+                if temp_access is not None and temp_access["status"] == "approved":
+                    temp_access["status"] = "expired"
+    
+    async def _cleanup_temporary_objects(self, temp_access: Dict[str, Any]):
+        """Remove the temporary IdM objects of a stored request"""
+        request_id = temp_access["id"]
+        prefix = f"{temp_access['application']}-{temp_access['environment']}-{temp_access['role']}"
+        temp_suffix = f"temp-{request_id[:8]}"
         
-        self.config_manager.save_config(config)
+        # Remove temporary objects (in reverse order of creation)
+        temp_sudo = f"{prefix}-sudo-temp-{temp_suffix}"
+        temp_hbac = f"{prefix}-temp-{temp_suffix}"
+        temp_posix_group = f"{prefix}-posix-{temp_suffix}"
+        temp_ext_group = f"{prefix}-{temp_suffix}"
+        
+        batch = IdMBatch()
+        batch.queue("sudorule_del", [temp_sudo])
+        batch.queue("hbacrule_del", [temp_hbac])
+        batch.queue("group_del", [temp_posix_group])
+        batch.queue("group_del", [temp_ext_group])
+        await batch.flush_async()
+        
+        logger.info("Cleaned up temporary access for request %s", request_id)
+    
+    async def revoke_access(self, request_id: str):
+        """Revoke temporary access before expiration"""
+        config = await asyncio.to_thread(self.config_manager.load_config)
+        temp_access = config["temporary_access"].get(request_id)
+        if temp_access is None:
+            return
+        seen_status = temp_access["status"]
+        
+        # Remove the objects before taking the config lock, then re-read the row
+        await self._cleanup_temporary_objects(temp_access)
+        
+        async with self.config_manager.mutate() as config:
+            temp_access = config["temporary_access"].get(request_id)
+            if temp_access is None:
+                return
+            changed = temp_access["status"] != seen_status
+            temp_access["status"] = "revoked"
+        
+        # Approved while the cleanup ran, so its objects may have been created after it
+        if changed:
+            await self._cleanup_temporary_objects(temp_access)
 
 class IdMManager:
     """Manages IdM operations"""
     
-    def __init__(self):
-        self.sudo_templates = {
-            "full": SudoTemplate(
-                name="full",
-                commands=["ALL"],
-                description="Full sudo access"
-            ),
-            "devops": SudoTemplate(
-                name="devops", 
-                commands=[
-                    "/usr/bin/systemctl",
-                    "/usr/bin/journalctl",
-                    "/bin/systemctl",
-                    "/bin/journalctl"
-                ],
-                description="DevOps operations"
-            ),
-            "readonly": SudoTemplate(
-                name="readonly",
-                commands=[
-                    "/usr/bin/cat",
-                    "/usr/bin/less",
-                    "/usr/bin/tail",
-                    "/usr/bin/head",
-                    "/usr/bin/journalctl -xe"
-                ],
-                description="Read-only access"
-            )
-        }
+    RESULT_SECTIONS = ("hostgroups", "external_groups", "posix_groups", "hbac_rules", "sudo_rules")
+    
+    # Parsed listings by IPA command as (time.monotonic() when fetched, value)
+    _listings: Dict[str, Tuple[float, List[Any]]] = {}
+    _listings_lock = threading.Lock()
     
     def test_connection(self, connection_test: IdMConnectionTest) -> Dict[str, Any]:
         """Test connection to IdM server"""
@@ -379,17 +858,14 @@ class IdMManager:
             echo_cmd = ["echo", connection_test.password]
             
             # Test connection by trying to authenticate
-            test_cmd = ["ipa", "user-show", connection_test.username]
-            result = IdMCommand.run_command(test_cmd)
+            result = IdMCommand.run_command("user_show", [connection_test.username])
             
             if result.get("success"):
                 # Get server info
-                info_cmd = ["ipa", "config-show"]
-                info_result = IdMCommand.run_command(info_cmd)
+                info_result = IdMCommand.run_command("config_show")
                 
                 # Get hosts count
-                hosts_cmd = ["ipa", "host-find", "--sizelimit=0"]
-                hosts_result = IdMCommand.run_command(hosts_cmd)
+                hosts_result = IdMCommand.run_command("host_find", [], {"sizelimit": 0})
                 
                 hosts_count = 0
                 if hosts_result.get("success") and "result" in hosts_result:
@@ -410,7 +886,7 @@ class IdMManager:
                 }
                 
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -419,48 +895,88 @@ class IdMManager:
     def setup_trusted_realms(self, trusted_realms: List[TrustedRealmSetup]) -> Dict[str, Any]:
         """Set up trusted AD realms"""
         results = {"success": True, "trusts": [], "errors": []}
-        
-        for realm in trusted_realms:
-            try:
-                # Create trust relationship
-                trust_cmd = [
-                    "ipa", "trust-add",
-                    "--admin", realm.admin_username,
-                    "--password", realm.admin_password,
-                    realm.domain
-                ]
-                
-                result = IdMCommand.run_command(trust_cmd)
+        try:
+            for realm in trusted_realms:
+                try:
+                    # Create trust relationship
+                    result = IdMCommand.run_command(
+                        "trust_add",
+                        [realm.domain],
+                        {"realm_admin": realm.admin_username, "realm_passwd": realm.admin_password}
+                    )
                 
-                if result.get("success"):
-                    results["trusts"].append({
-                        "domain": realm.domain,
-                        "netbios_name": realm.netbios_name,
-                        "status": "success"
-                    })
-                else:
+                    if result.get("success"):
+                        results["trusts"].append({
+                            "domain": realm.domain,
+                            "netbios_name": realm.netbios_name,
+                            "status": "success"
+                        })
+                    else:
+                        results["errors"].append({
+                            "domain": realm.domain,
+                            "error": result.get("error", "Trust creation failed")
+                        })
+                        results["success"] = False
+                    
+                except Exception as e:
+                    logger.error("Failed to create trust for %s: %s", realm.domain, e)
                     results["errors"].append({
                         "domain": realm.domain,
-                        "error": result.get("error", "Trust creation failed")
+                        "error": str(e)
                     })
                     results["success"] = False
-                    
-            except Exception as e:
-                logger.error(f"Failed to create trust for {realm.domain}: {e}")
-                results["errors"].append({
-                    "domain": realm.domain,
-                    "error": str(e)
-                })
-                results["success"] = False
+        finally:
+            # Drop the cached trust list once the trusts exist, so a listing
+            # fetched while they were being added is not served afterwards
+            self.invalidate_listing("trust_find")
         
         return results
     
     # ... keep existing code (all other methods)
+    @classmethod
+    def _cached_listing(cls, cmd_name: str) -> Optional[List[Any]]:
+        """Return a copy of the listing fetched within LISTING_TTL, if any"""
+        with cls._listings_lock:
+            entry = cls._listings.get(cmd_name)
+        if entry is None or time.monotonic() - entry[0] >= LISTING_TTL:
+            return None
+        return list(entry[1])
+    
+    @classmethod
+    def _store_listing(cls, cmd_name: str, result: Dict[str, Any], value: List[Any]) -> List[Any]:
+        """Remember a listing from a successful command; a failure drops the cached one"""
+        with cls._listings_lock:
+            if result.get("success"):
+                cls._listings[cmd_name] = (time.monotonic(), list(value))
+            else:
+                cls._listings.pop(cmd_name, None)
+        return value
+    
+    @classmethod
+    def invalidate_listing(cls, cmd_name: str):
+        """Drop a cached listing so the next call fetches it again"""
+        with cls._listings_lock:
+            cls._listings.pop(cmd_name, None)
+    
     def get_trust_domains(self) -> List[TrustDomain]:
         """Get list of trusted AD domains"""
-        cmd = ["ipa", "trust-find", "--raw"]
-        result = IdMCommand.run_command(cmd)
-        
+        domains = self._cached_listing("trust_find")
+        if domains is None:
+            result = IdMCommand.run_command("trust_find", [], {"raw": True})
+            domains = self._store_listing("trust_find", result, self._parse_trust_domains(result))
+        return domains
+    
+    async def get_trust_domains_async(self) -> List[TrustDomain]:
+        """Get list of trusted AD domains without blocking the event loop"""
+        domains = self._cached_listing("trust_find")
+        if domains is None:
+            result = await IdMCommand.run_command_async("trust_find", [], {"raw": True})
+            domains = self._store_listing("trust_find", result, self._parse_trust_domains(result))
+        return domains
+    
+    @staticmethod
+    def _parse_trust_domains(result: Dict[str, Any]) -> List[TrustDomain]:
+        """Build TrustDomain entries from trust_find output"""
         domains = []
         if result.get("success"):
             # Parse trust-find output
@@ -474,15 +990,21 @@ class IdMManager:
                             type="ad"
                         ))
             except Exception as e:
-                logger.error(f"Failed to parse trust domains: {e}")
+                logger.error("Failed to parse trust domains: %s", e)
         
         return domains
     
-    def get_enrolled_hosts(self) -> List[str]:
-        """Get list of enrolled hosts"""
-        cmd = ["ipa", "host-find", "--raw"]
-        result = IdMCommand.run_command(cmd)
-        
+    async def get_enrolled_hosts_async(self, refresh: bool = False) -> List[str]:
+        """Get list of enrolled hosts, bypassing the listing cache on refresh"""
+        hosts = None if refresh else self._cached_listing("host_find")
+        if hosts is None:
+            result = await IdMCommand.run_command_async("host_find", [], {"raw": True})
+            hosts = self._store_listing("host_find", result, self._parse_hosts(result))
+        return hosts
+    
+    @staticmethod
+    def _parse_hosts(result: Dict[str, Any]) -> List[str]:
+        """Extract host names from host_find output"""
         hosts = []
         if result.get("success") and "result" in result:
             for host in result["result"]:
@@ -492,120 +1014,169 @@ class IdMManager:
         
         return hosts
     
-    def create_application_objects(self, app: Application, realms: List[str]) -> Dict[str, Any]:
-        """Create all IdM objects for an application"""
-        results = {
-            "hostgroups": {},
-            "external_groups": {},
-            "posix_groups": {},
-            "hbac_rules": {},
-            "sudo_rules": {},
-            "errors": []
-        }
+    async def create_application_objects(self, app: Application, realms: List[str]) -> Dict[str, Any]:
+        """Create all IdM objects for an application
+        
+        Host groups are created first since every rule references one;
+        the objects for each (environment, role) pair are then applied
+        concurrently as independent batches. The commands come from the
+        cached _plan, so only host group membership is computed per apply.
+        """
+        results = {section: {} for section in self.RESULT_SECTIONS}
+        results["errors"] = []
+        hostgroup_batches = []
+        
+        # One fresh host listing serves every environment's host group; the
+        # cached copy is only good enough for the read-only listing endpoints
+        all_hosts = await self.get_enrolled_hosts_async(refresh=True)
+        
+        hostgroup_plan, access_plan, any_env_regex, app_only = self._plan(
+            app.name, tuple(realms),
+            tuple((env.name, env.host_pattern, tuple(env.roles)) for env in app.environments)
+        )
         
-        for env in app.environments:
-            env_name = env.name.lower()
-            
-            # Create host group
-            hostgroup_name = f"{app.name}-{env_name}-hosts"
-            self._create_hostgroup(hostgroup_name, results)
+        # Patterns built from {app} can only match hosts containing the app name,
+        # so narrow the list once instead of scanning every host
+        hosts = all_hosts
+        if app_only and not any(c in app.name for c in "*?["):
+            app_lower = app.name.lower()
+            hosts = [h for h in all_hosts if app_lower in h.lower()]
+        
+        # A single pass with the combined pattern drops hosts no environment wants.
+        # Hosts may match several environments, so the rest are still tested per environment.
+        candidates = [h for h in hosts if any_env_regex.match(h)]
+        
+        for hostgroup, calls, host_regex in hostgroup_plan:
+            batch, queued = self._queue_calls(calls)
             
             # Populate host group with matching hosts
-            self._populate_hostgroup(hostgroup_name, env.host_pattern.replace("{app}", app.name), results)
-            
-            for role in env.roles:
-                for realm in realms:
-                    # Create external group
-                    ext_group_name = f"{app.name}-{env_name}-{role}-{realm}"
-                    ad_group_name = f"IdM_{app.name}_{env_name}_{role}"
-                    
-                    self._create_external_group(ext_group_name, realm, ad_group_name, results)
-                    
-                    # Create POSIX group
-                    posix_group_name = f"{app.name}-{env_name}-{role}"
-                    self._create_posix_group(posix_group_name, ext_group_name, results)
-                    
-                    # Create HBAC rule
-                    hbac_rule_name = f"{app.name}-{env_name}-{role}-access"
-                    self._create_hbac_rule(hbac_rule_name, posix_group_name, hostgroup_name, results)
-                    
-                    # Create sudo rule
-                    sudo_rule_name = f"{app.name}-{env_name}-{role}-sudo"
-                    template = self.sudo_templates.get(role)
-                    if template:
-                        self._create_sudo_rule(sudo_rule_name, posix_group_name, hostgroup_name, template, results)
+            self._populate_hostgroup(batch, hostgroup, host_regex, candidates)
+            hostgroup_batches.append((batch, queued))
+        
+        access_batches = [self._queue_calls(calls) for calls in access_plan]
+        
+        semaphore = asyncio.Semaphore(IPA_CONCURRENCY)
+        await self._flush_batches(hostgroup_batches, results, semaphore)
+        await self._flush_batches(access_batches, results, semaphore)
         
         return results
     
-    def _create_hostgroup(self, name: str, results: Dict[str, Any]):
-        """Create host group"""
-        cmd = ["ipa", "hostgroup-add", name, "--desc", f"Host group for {name}"]
-        result = IdMCommand.run_command(cmd)
-        results["hostgroups"][name] = result
-    
-    def _populate_hostgroup(self, hostgroup: str, pattern: str, results: Dict[str, Any]):
-        """Populate host group with matching hosts"""
-        hosts = self.get_enrolled_hosts()
-        matching_hosts = [h for h in hosts if self._match_pattern(h, pattern)]
-        
-        for host in matching_hosts:
-            cmd = ["ipa", "hostgroup-add-member", hostgroup, "--hosts", host]
-            IdMCommand.run_command(cmd)
-    
-    def _match_pattern(self, hostname: str, pattern: str) -> bool:
-        """Simple wildcard matching"""
-        import re
-        regex_pattern = pattern.replace("*", ".*")
-        return bool(re.match(regex_pattern, hostname, re.IGNORECASE))
-    
-    def _create_external_group(self, name: str, realm: str, ad_group: str, results: Dict[str, Any]):
-        """Create external group linked to AD"""
-        cmd = ["ipa", "group-add", name, "--external", "--desc", f"External group for {ad_group}@{realm}"]
-        result = IdMCommand.run_command(cmd)
-        results["external_groups"][name] = result
-        
-        # Add external member
-        if result.get("success"):
-            member_cmd = ["ipa", "group-add-member", name, "--external", f"{ad_group}@{realm}"]
-            IdMCommand.run_command(member_cmd)
+    async def _flush_batches(self, batches: List[Tuple[IdMBatch, Dict[str, Dict[str, int]]]],
+                             results: Dict[str, Any], semaphore: asyncio.Semaphore):
+        """Flush independent batches concurrently and record each queued object's result"""
+        async def flush(batch: IdMBatch) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await batch.flush_async()
+        
+        batch_results = await asyncio.gather(*(flush(batch) for batch, _ in batches))
+        for (_, queued), flushed in zip(batches, batch_results):
+            for section, entries in queued.items():
+                for name, index in entries.items():
+                    results[section][name] = flushed[index]
     
-    def _create_posix_group(self, name: str, external_group: str, results: Dict[str, Any]):
-        """Create POSIX group with external group as member"""
-        cmd = ["ipa", "group-add", name, "--desc", f"POSIX group for {name}"]
-        result = IdMCommand.run_command(cmd)
-        results["posix_groups"][name] = result
+    def _populate_hostgroup(self, batch: IdMBatch, hostgroup: str, host_regex: re.Pattern, hosts: List[str]):
+        """Populate host group with hosts matching the compiled pattern"""
+        matching_hosts = [h for h in hosts if host_regex.match(h)]
         
-        # Add external group as member
-        if result.get("success"):
-            member_cmd = ["ipa", "group-add-member", name, "--groups", external_group]
-            IdMCommand.run_command(member_cmd)
+        if matching_hosts:
+            batch.queue("hostgroup_add_member", [hostgroup], {"host": matching_hosts})
     
-    def _create_hbac_rule(self, name: str, group: str, hostgroup: str, results: Dict[str, Any]):
-        """Create HBAC rule"""
-        cmd = ["ipa", "hbacrule-add", name, "--desc", f"HBAC rule for {name}"]
-        result = IdMCommand.run_command(cmd)
-        results["hbac_rules"][name] = result
-        
-        if result.get("success"):
-            # Add group and hostgroup
-            IdMCommand.run_command(["ipa", "hbacrule-add-user", name, "--groups", group])
-            IdMCommand.run_command(["ipa", "hbacrule-add-host", name, "--hostgroups", hostgroup])
-            IdMCommand.run_command(["ipa", "hbacrule-add-service", name, "--hbacsvcs", "sshd"])
+    @staticmethod
+    def _queue_calls(calls: Tuple[Tuple[Optional[str], str, Tuple[Any, ...], Dict[str, Any]], ...]
+                     ) -> Tuple[IdMBatch, Dict[str, Dict[str, int]]]:
+        """Queue planned calls into a new batch, recording where each result section's objects land"""
+        batch, queued = IdMBatch(), {section: {} for section in IdMManager.RESULT_SECTIONS}
+        for section, method, args, options in calls:
+            index = batch.queue(method, list(args), dict(options))
+            if section is not None:
+                queued[section][args[0]] = index
+        return batch, queued
     
-    def _create_sudo_rule(self, name: str, group: str, hostgroup: str, template: SudoTemplate, results: Dict[str, Any]):
-        """Create sudo rule"""
-        cmd = ["ipa", "sudorule-add", name, "--desc", f"Sudo rule for {name}"]
-        result = IdMCommand.run_command(cmd)
-        results["sudo_rules"][name] = result
-        
-        if result.get("success"):
-            # Add group and hostgroup
-            IdMCommand.run_command(["ipa", "sudorule-add-user", name, "--groups", group])
-            IdMCommand.run_command(["ipa", "sudorule-add-host", name, "--hostgroups", hostgroup])
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _plan(app_name: str, realms: Tuple[str, ...], environments: Tuple[Tuple[str, str, Tuple[str, ...]], ...]):
+        """Build the IPA calls for an application definition
+        
+        Returns (hostgroup_plan, access_plan, any_env_regex, app_only).
+        Each hostgroup_plan entry is (name, calls, compiled host pattern);
+        each access_plan entry holds the calls for one (environment, role)
+        batch. A call is (result section or None, method, args, options).
+        any_env_regex matches a host wanted by any environment and app_only
+        is true when every pattern includes {app}.
+        """
+        hostgroup_plan = []
+        access_plan = []
+        translated = []
+        for env_name, host_pattern, roles in environments:
+            env_name = env_name.lower()
+            hostgroup = f"{app_name}-{env_name}-hosts"
+            glob_pattern = host_pattern.replace("{app}", app_name)
+            translated.append(fnmatch.translate(glob_pattern))
+            host_regex = IdMManager._compile_glob(glob_pattern)
+            hostgroup_calls = (("hostgroups", "hostgroup_add", (hostgroup,), {"description": f"Host group for {hostgroup}"}),)
+            hostgroup_plan.append((hostgroup, hostgroup_calls, host_regex))
             
-            # Add commands
-            for cmd_str in template.commands:
-                IdMCommand.run_command(["ipa", "sudorule-add-allow-command", name, "--sudocmds", cmd_str])
+            for role in roles:
+                # Realms share the role's POSIX group and rules, so keep them in one batch
+                access_plan.append(tuple(IdMManager._access_calls(app_name, env_name, role, realms, hostgroup)))
+        any_env_regex = re.compile("|".join(f"(?:{t})" for t in translated) or "(?!)", re.IGNORECASE)
+        app_only = all("{app}" in host_pattern for _, host_pattern, _ in environments)
+        return tuple(hostgroup_plan), tuple(access_plan), any_env_regex, app_only
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_glob(pattern: str) -> re.Pattern:
+        """Compile a host glob, shared by every application that uses the same pattern"""
+        return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+    
+    @staticmethod
+    def _access_calls(app_name: str, env_name: str, role: str, realms: Tuple[str, ...], hostgroup: str):
+        """Yield the group, HBAC and sudo calls for one (environment, role) pair"""
+        base = f"{app_name}-{env_name}-{role}"
+        ad_group = f"IdM_{app_name}_{env_name}_{role}"
+        posix_group = base
+        hbac_rule = f"{base}-access"
+        sudo_rule = f"{base}-sudo"
+        template = SUDO_TEMPLATES.get(role)
+        
+        if not realms:
+            return
+        
+        ext_groups = []
+        for realm in realms:
+            # External group linked to AD
+            ext_group = f"{base}-{realm}"
+            ext_groups.append(ext_group)
+            yield ("external_groups", "group_add", (ext_group,),
+                   {"external": True, "description": f"External group for {ad_group}@{realm}"})
+            yield (None, "group_add_member", (ext_group,), {"ipaexternalmember": [f"{ad_group}@{realm}"]})
+        
+        # POSIX group with every realm's external group as member
+        yield ("posix_groups", "group_add", (posix_group,), {"description": f"POSIX group for {posix_group}"})
+        yield (None, "group_add_member", (posix_group,), {"group": ext_groups})
+        
+        # HBAC rule
+        yield ("hbac_rules", "hbacrule_add", (hbac_rule,), {"description": f"HBAC rule for {hbac_rule}"})
+        yield (None, "hbacrule_add_user", (hbac_rule,), {"group": [posix_group]})
+        yield (None, "hbacrule_add_host", (hbac_rule,), {"hostgroup": [hostgroup]})
+        yield (None, "hbacrule_add_service", (hbac_rule,), {"hbacsvc": ["sshd"]})
+        
+        # Sudo rule
+        if template:
+            yield ("sudo_rules", "sudorule_add", (sudo_rule,), {"description": f"Sudo rule for {sudo_rule}"})
+            yield (None, "sudorule_add_user", (sudo_rule,), {"group": [posix_group]})
+            yield (None, "sudorule_add_host", (sudo_rule,), {"hostgroup": [hostgroup]})
+            yield (None, "sudorule_add_allow_command", (sudo_rule,), {"sudocmd": list(template.commands)})
+
+# Wall-clock timestamp refreshed once per second for lightweight endpoints
+_NOW_STR = datetime.datetime.now().isoformat()
+
+async def _tick():
+    """Refresh the cached timestamp string every second"""
+    global _NOW_STR
+    while True:
+        _NOW_STR = datetime.datetime.now().isoformat()
+        await asyncio.sleep(1)
 
 # Global instances
 idm_manager = IdMManager()
@@ -616,13 +1187,13 @@ temp_access_manager = TemporaryAccessManager(idm_manager, config_manager)
 
 # Setup wizard endpoints
 @app.post("/api/setup/test-connection")
-async def test_idm_connection(connection_test: IdMConnectionTest):
+def test_idm_connection(connection_test: IdMConnectionTest):
     """Test connection to IdM server during setup"""
     try:
         result = idm_manager.test_connection(connection_test)
         return result
     except Exception as e:
-        logger.error(f"Connection test failed: {e}")
+        logger.error("Connection test failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/setup/complete")
@@ -630,7 +1201,7 @@ async def complete_setup(setup_config: SetupConfiguration):
     """Complete the initial setup"""
     try:
         # Test IdM connection first
-        connection_result = idm_manager.test_connection(setup_config.idm_connection)
+        connection_result = await asyncio.to_thread(idm_manager.test_connection, setup_config.idm_connection)
         
         if not connection_result.get("success"):
             raise HTTPException(
@@ -641,113 +1212,111 @@ async def complete_setup(setup_config: SetupConfiguration):
         # Set up trusted realms
         trust_results = {"success": True, "trusts": [], "errors": []}
         if setup_config.trusted_realms:
-            trust_results = idm_manager.setup_trusted_realms(setup_config.trusted_realms)
+            trust_results = await asyncio.to_thread(idm_manager.setup_trusted_realms, setup_config.trusted_realms)
         
         # Save configuration
-        config = config_manager.load_config()
-        config["setup_completed"] = True
-        config["idm_connection"] = {
-            "server": setup_config.idm_connection.server,
-            "realm": setup_config.idm_connection.realm,
-            "username": setup_config.idm_connection.username,
-            # Don't save password in config for security
-        }
-        config["trusted_realms"] = [
-            {
-                "domain": realm.domain,
-                "netbios_name": realm.netbios_name
+        async with config_manager.mutate() as config:
+            config["setup_completed"] = True
+            config["idm_connection"] = {
+                "server": setup_config.idm_connection.server,
+                "realm": setup_config.idm_connection.realm,
+                "username": setup_config.idm_connection.username,
+                # Don't save password in config for security
             }
-            for realm in setup_config.trusted_realms
-        ]
-        config["setup_completed_at"] = datetime.datetime.now().isoformat()
+            config["trusted_realms"] = [
+                {
+                    "domain": realm.domain,
+                    "netbios_name": realm.netbios_name
+                }
+                for realm in setup_config.trusted_realms
+            ]
+            config["setup_completed_at"] = datetime.datetime.now().isoformat()
         
-        if config_manager.save_config(config):
-            return {
-                "message": "Setup completed successfully",
-                "idm_connection": connection_result,
-                "trust_setup": trust_results
-            }
-        else:
-            raise HTTPException(status_code=500, detail="Failed to save setup configuration")
+        return {
+            "message": "Setup completed successfully",
+            "idm_connection": connection_result,
+            "trust_setup": trust_results
+        }
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Setup completion failed: {e}")
+        logger.error("Setup completion failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # API Endpoints
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.datetime.now()}
+    return {"status": "healthy", "timestamp": _NOW_STR}
 
 @app.get("/api/trusts", response_model=List[TrustDomain])
-async def get_trust_domains():
+def get_trust_domains():
     """Get list of trusted AD domains"""
     try:
         domains = idm_manager.get_trust_domains()
         return domains
     except Exception as e:
-        logger.error(f"Failed to get trust domains: {e}")
+        logger.error("Failed to get trust domains: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/applications")
-async def get_applications():
+@app.get("/api/applications", response_model=None)
+def get_applications(request: Request) -> Response:
     """Get list of configured applications"""
-    config = config_manager.load_config()
-    return config.get("applications", {})
+    headers = {}
+    etag = config_manager.etag()
+    if etag is not None:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        headers["ETag"] = etag
+    
+    # Already-encoded JSON, so skip FastAPI's response serialization
+    return Response(config_manager.config_json("applications"), media_type="application/json", headers=headers)
 
 @app.post("/api/applications")
-async def create_application(app_request: ApplicationRequest):
+async def create_application(app_request: ApplicationRequest, background_tasks: BackgroundTasks):
     """Create new application configuration"""
     try:
-        config = config_manager.load_config()
-        
-        if app_request.name in config.get("applications", {}):
-            raise HTTPException(status_code=400, detail="Application already exists")
-        
-        # Create application with default environments
-        app = Application(
-            name=app_request.name,
-            description=app_request.description,
-            realms=app_request.realms
-        )
-        
-        if "applications" not in config:
-            config["applications"] = {}
-        
-        config["applications"][app_request.name] = app.dict()
+        async with config_manager.mutate(background_tasks) as config:
+            if app_request.name in config.get("applications", {}):
+                raise HTTPException(status_code=400, detail="Application already exists")
+            
+            # Create application with default environments
+            app = Application(
+                name=app_request.name,
+                description=app_request.description,
+                realms=app_request.realms
+            )
+            
+            if "applications" not in config:
+                config["applications"] = {}
+            
+            config["applications"][app_request.name] = app.model_dump(mode="json")
         
-        if config_manager.save_config(config):
-            return {"message": "Application created successfully", "application": app.dict()}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to save configuration")
+        return {"message": "Application created successfully", "application": app}
             
     except Exception as e:
-        logger.error(f"Failed to create application: {e}")
+        logger.error("Failed to create application: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/applications/{app_name}/apply")
-async def apply_application(app_name: str, apply_request: ApplyRequest):
+async def apply_application(app_name: str, apply_request: ApplyRequest, background_tasks: BackgroundTasks):
     """Apply IdM configuration for an application"""
     try:
-        config = config_manager.load_config()
+        app = await asyncio.to_thread(config_manager.get_application, app_name)
         
-        if app_name not in config.get("applications", {}):
+        if app is None:
             raise HTTPException(status_code=404, detail="Application not found")
         
-        app_data = config["applications"][app_name]
-        app = Application(**app_data)
-        
         # Apply IdM configuration
-        results = idm_manager.create_application_objects(app, app.realms)
-        
-        # Update application status
-        app_data["last_applied"] = datetime.datetime.now().isoformat()
-        app_data["last_apply_results"] = results
+        results = await idm_manager.create_application_objects(app, app.realms)
         
-        config_manager.save_config(config)
+        # Update application status on the current config, the apply may have taken a while
+        async with config_manager.mutate(background_tasks) as config:
+            app_data = config.get("applications", {}).get(app_name)
+            if app_data is not None:
+                app_data["last_applied"] = datetime.datetime.now().isoformat()
+                app_data["last_apply_results"] = results
         
         return {
             "message": "Application configuration applied successfully",
@@ -755,23 +1324,21 @@ async def apply_application(app_name: str, apply_request: ApplyRequest):
         }
         
     except Exception as e:
-        logger.error(f"Failed to apply application: {e}")
+        logger.error("Failed to apply application: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/status")
 async def get_system_status():
     """Get overall system status"""
     try:
-        config = config_manager.load_config()
-        
-        # Check IdM connectivity
-        idm_status = IdMCommand.run_command(["ipa", "user-show", "admin"])
+        config = await asyncio.to_thread(config_manager.load_config)
         
-        # Get enrolled hosts count
-        hosts = idm_manager.get_enrolled_hosts()
-        
-        # Get trust domains count
-        domains = idm_manager.get_trust_domains()
+        # Check IdM connectivity and count enrolled hosts and trust domains concurrently
+        idm_status, hosts, domains = await asyncio.gather(
+            IdMCommand.run_command_async("user_show", ["admin"]),
+            idm_manager.get_enrolled_hosts_async(),
+            idm_manager.get_trust_domains_async(),
+        )
         
         return {
             "idm_connected": idm_status.get("success", False),
@@ -784,23 +1351,19 @@ async def get_system_status():
         }
         
     except Exception as e:
-        logger.error(f"Failed to get system status: {e}")
+        logger.error("Failed to get system status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/test")
-async def test_access(test_request: TestAccessRequest):
+def test_access(test_request: TestAccessRequest):
     """Test user access to host and command"""
     try:
         user_principal = f"{test_request.user}@{test_request.domain}"
         
         # Run HBAC test
-        hbac_cmd = [
-            "ipa", "hbactest",
-            "--user", test_request.user,
-            "--host", test_request.target_host,
-            "--service", "sshd"
-        ]
-        hbac_result = IdMCommand.run_command(hbac_cmd)
+        hbac_result = IdMCommand.run_command(
+            "hbactest", [], {"user": test_request.user, "targethost": test_request.target_host, "service": "sshd"}
+        )
         
         # Test sudo access (simplified - would need SSH connection in real implementation)
         sudo_test_result = {
@@ -817,105 +1380,116 @@ async def test_access(test_request: TestAccessRequest):
         }
         
     except Exception as e:
-        logger.error(f"Failed to test access: {e}")
+        logger.error("Failed to test access: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/export")
-async def export_configuration():
+@app.get("/api/export", response_model=None)
+def export_configuration(request: Request) -> Response:
     """Export current configuration"""
     try:
-        config = config_manager.load_config()
-        return {
-            "configuration": config,
-            "exported_at": datetime.datetime.now().isoformat(),
-            "format": "json"
-        }
+        headers = {}
+        etag = config_manager.etag()
+        if etag is not None:
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+        
+        # Splice the cached config encoding into the envelope instead of re-encoding it
+        body = b'{"configuration":%b,"exported_at":%b,"format":"json"}' % (
+            config_manager.config_json(),
+            orjson.dumps(datetime.datetime.now().isoformat()),
+        )
+        return Response(body, media_type="application/json", headers=headers)
     except Exception as e:
-        logger.error(f"Failed to export configuration: {e}")
+        logger.error("Failed to export configuration: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/applications/{app_name}")
-async def delete_application(app_name: str):
+async def delete_application(app_name: str, background_tasks: BackgroundTasks):
     """Delete application configuration"""
     try:
-        config = config_manager.load_config()
-        
-        if app_name not in config.get("applications", {}):
-            raise HTTPException(status_code=404, detail="Application not found")
-        
-        del config["applications"][app_name]
+        async with config_manager.mutate(background_tasks) as config:
+            if app_name not in config.get("applications", {}):
+                raise HTTPException(status_code=404, detail="Application not found")
+            
+            del config["applications"][app_name]
         
-        if config_manager.save_config(config):
-            return {"message": "Application deleted successfully"}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to save configuration")
+        return {"message": "Application deleted successfully"}
             
     except Exception as e:
-        logger.error(f"Failed to delete application: {e}")
+        logger.error("Failed to delete application: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/temporary-access")
-async def get_temporary_access_requests():
+@app.get("/api/temporary-access", response_model=None)
+def get_temporary_access_requests() -> ORJSONResponse:
     """Get list of temporary access requests"""
     try:
+        # Expired grants are cleaned up by the background worker
         config = config_manager.load_config()
-        
-        # Clean up expired access first
-        temp_access_manager.cleanup_expired_access()
-        
-        # Return current requests
-        return config.get("temporary_access", [])
+        return ORJSONResponse(list(config["temporary_access"].values()))
     except Exception as e:
-        logger.error(f"Failed to get temporary access requests: {e}")
+        logger.error("Failed to get temporary access requests: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/temporary-access/grant")
 async def grant_temporary_access(grant_request: TemporaryAccessGrant):
     """Grant temporary access to a user"""
     try:
-        temp_request = temp_access_manager.grant_temporary_access(grant_request)
+        temp_request = await temp_access_manager.grant_temporary_access(grant_request)
         return {
             "message": "Temporary access granted successfully",
-            "request": temp_request.dict()
+            "request": temp_request
         }
     except Exception as e:
-        logger.error(f"Failed to grant temporary access: {e}")
+        logger.error("Failed to grant temporary access: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/temporary-access/{request_id}/approve")
 async def approve_temporary_access(request_id: str):
     """Approve a pending temporary access request"""
     try:
-        config = config_manager.load_config()
+        config = await asyncio.to_thread(config_manager.load_config)
+        temp_access = config["temporary_access"].get(request_id)
+        if temp_access is None or temp_access["status"] != "pending":
+            raise HTTPException(status_code=404, detail="Request not found or not pending")
+        
+        # Create the objects before taking the config lock, then re-check the row
+        request = temp_access_manager.from_stored(temp_access)
+        await temp_access_manager._create_temporary_objects(request)
         
-        for temp_access in config.get("temporary_access", []):
-            if temp_access["id"] == request_id and temp_access["status"] == "pending":
-                request = TemporaryAccessRequest(**temp_access)
-                temp_access_manager._create_temporary_objects(request)
+        async with config_manager.mutate() as config:
+            temp_access = config["temporary_access"].get(request_id)
+            status = temp_access and temp_access["status"]
+            if status == "pending":
                 temp_access["status"] = "approved"
                 temp_access["approved_at"] = datetime.datetime.now().isoformat()
                 temp_access["approved_by"] = "admin"  # In real implementation, get from auth
-                break
-        else:
-            raise HTTPException(status_code=404, detail="Request not found or not pending")
         
-        config_manager.save_config(config)
+        if status == "pending":
+            temp_access_manager._schedule_cleanup(request.id, request.expires_at)
+        elif status != "approved":
+            # Revoked or deleted while the objects were being created
+            await temp_access_manager._cleanup_temporary_objects(request.model_dump(mode="json"))
+            raise HTTPException(status_code=404, detail="Request not found or not pending")
         return {"message": "Access request approved successfully"}
         
     except Exception as e:
-        logger.error(f"Failed to approve temporary access: {e}")
+        logger.error("Failed to approve temporary access: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/temporary-access/{request_id}/revoke")
 async def revoke_temporary_access(request_id: str):
     """Revoke temporary access"""
     try:
-        temp_access_manager.revoke_access(request_id)
+        await temp_access_manager.revoke_access(request_id)
         return {"message": "Temporary access revoked successfully"}
     except Exception as e:
-        logger.error(f"Failed to revoke temporary access: {e}")
+        logger.error("Failed to revoke temporary access: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
+    # loop/http default to "auto", which picks uvloop and httptools when installed
+    # Config writes and the temporary access cleanup worker are only
+    # coordinated within one process, so run a single worker
     uvicorn.run(app, host="0.0.0.0", port=8000)